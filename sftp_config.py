@@ -1,5 +1,16 @@
+import json
+import os
+
+import jsonschema
 import yaml
 
+# libyaml's C loader is much faster than the pure-Python one when available.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sftp_config.schema.json")
+with open(_SCHEMA_PATH, "r") as _f:
+    SCHEMA = json.load(_f)
+
 
 class SFTPConfig:
     def __init__(self):
@@ -17,56 +28,70 @@ class SFTPConfig:
         self.sftp_sleep_interval = -1
         self.keep_alive_enabled = 0
         self.retry_attempts = 0
+        self.ssh_compression = False
+        self.transfer_backend = "paramiko"
+        self.sftp_block_size = 261120
+        # Parsed private key, loaded once by sftp_tester.run_tests.
+        self.pkey = None
+        # Agent and ~/.ssh keys to try when no key file is configured, also
+        # loaded once by sftp_tester.run_tests.
+        self.fallback_keys = []
 
     @classmethod
     def from_yaml(cls, path: str) -> "SFTPConfig":
-        """Load configuration values from a YAML file."""
-        with open(path, "r") as f:
-            data = yaml.safe_load(f) or {}
-        cfg = cls()
+        """Load configuration values from a YAML file.
+
+        The parsed values are cached in a ``<path>.json`` sidecar which is
+        reused for as long as it is newer than the YAML file. Raises
+        ``jsonschema.ValidationError`` if the values don't match
+        ``sftp_config.schema.json``, including on unknown keys.
+        """
+        data = cls._load_data(path)
+        jsonschema.validate(data, SCHEMA)
+        # JSON Schema accepts 2.0 as an integer; store it as one so it works
+        # with range() and friends.
         for key, value in data.items():
-            if hasattr(cfg, key):
-                setattr(cfg, key, value)
+            types = SCHEMA["properties"][key].get("type", ())
+            if "integer" in types and isinstance(value, float):
+                data[key] = int(value)
+        cfg = cls()
+        cfg.__dict__.update(data)
+        # Compare effective values so a lone min or max is checked against
+        # the other's default.
+        if cfg.min_test_file_size_bytes > cfg.max_test_file_size_bytes:
+            raise jsonschema.ValidationError(
+                "min_test_file_size_bytes must not exceed max_test_file_size_bytes"
+            )
         return cfg
 
-    def setHost(self, host: str):
-        self.host = host
-
-    def setUserName(self, username: str):
-        self.username = username
-
-    def setRootDir(self, root: str):
-        self.root_dir = root
-
-    def setSshPrivateKeyPassPhrase(self, phrase: str):
-        self.ssh_private_key_passphrase = phrase
-
-    def setSshPrivateKeyPath(self, path: str):
-        self.ssh_private_key_path = path
-
-    def minTestFileSizeBytes(self, size: int):
-        self.min_test_file_size_bytes = int(size)
-
-    def maxTestFileSizeBytes(self, size: int):
-        self.max_test_file_size_bytes = int(size)
-
-    def numTestFiles(self, num: int):
-        self.num_test_files = int(num)
-
-    def ConnectTimeoutSeconds(self, timeout: int):
-        self.connect_timeout_seconds = int(timeout)
-
-    def TransferTimeoutSeconds(self, timeout: int):
-        self.transfer_timeout_seconds = int(timeout)
-
-    def sftpThreads(self, threads: int):
-        self.sftp_threads = int(threads)
-
-    def sftpSleepInterval(self, interval: int):
-        self.sftp_sleep_interval = int(interval)
-
-    def keepAliveEnabled(self, enabled: int):
-        self.keep_alive_enabled = int(enabled)
-
-    def retryAttempts(self, attempts: int):
-        self.retry_attempts = int(attempts)
+    @staticmethod
+    def _load_data(path: str) -> dict:
+        json_path = path + ".json"
+        st = os.stat(path)
+        # Identify the YAML by exact mtime and size rather than "sidecar is
+        # newer", so a config replaced by an older file (cp -p, rsync -t, an
+        # archive restore) isn't masked by stale cached values.
+        source = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        try:
+            with open(json_path, "r") as f:
+                cached = json.load(f)
+            if cached.get("source") == source:
+                return cached["data"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+        with open(path, "r") as f:
+            data = yaml.load(f, Loader=_YamlLoader) or {}
+        try:
+            # The sidecar holds the same secrets as the YAML, so give it the
+            # same permissions.
+            fd = os.open(json_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, st.st_mode & 0o777)
+            with open(fd, "w") as f:
+                json.dump({"source": source, "data": data}, f)
+        except (OSError, TypeError, ValueError):
+            # The cache is only an optimization; a read-only directory or a
+            # value JSON can't represent just means we parse YAML next time.
+            try:
+                os.remove(json_path)
+            except OSError:
+                pass
+        return data
@@ -1,21 +1,49 @@
 import argparse
+import asyncio
+import json
+import mmap
 import os
+import posixpath
+import queue
 import random
+import socket
 import stat
 import tempfile
+import threading
 import time
 import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
-from typing import List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
 import paramiko
+from cryptography.hazmat.primitives import hashes, hmac
+from cryptography.hazmat.primitives.asymmetric import x25519
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from tqdm import tqdm
 import logging
 
 from sftp_config import SFTPConfig
 
-@dataclass
+try:
+    import asyncssh
+except ImportError:  # optional; only needed for transfer_backend: asyncssh
+    asyncssh = None
+
+SSH_PORT = 22
+# The window we advertise for data the server sends us (2 MiB by default in
+# Paramiko). Uploads are paced by the server's window instead, so this only
+# helps the replies coming back.
+TRANSPORT_WINDOW_SIZE = 2**31 - 1
+SOCKET_BUFFER_SIZE = 32 << 20
+UPLOAD_CHUNK_SIZE = 1 << 20
+# Flush the NDJSON results every this many lines so a crashed run keeps
+# almost everything it measured.
+RESULTS_FLUSH_EVERY = 64
+
+
+@dataclass(slots=True, frozen=True)
 class FileStat:
     name: str
     size: int
@@ -24,31 +52,42 @@ class FileStat:
     success: bool
     error: Optional[str] = None
 
-@dataclass
-class TestReport:
-    file_stats: List[FileStat] = field(default_factory=list)
 
-    def add(self, stat: FileStat):
-        self.file_stats.append(stat)
+REPORT_HEADER = "SFTP Test Report\n=================\n"
+
+
+def _format_line(stat: FileStat) -> str:
+    error = f" Error: {stat.error}" if stat.error else ""
+    return (
+        f"File: {stat.name} Size: {stat.size} bytes Success: {stat.success}"
+        f" ConnectTime: {stat.connect_time:.2f}s TransferTime: {stat.transfer_time:.2f}s"
+        f"{error}\n"
+    )
 
-    def to_text(self) -> str:
-        lines = ["SFTP Test Report", "================="]
-        for stat in self.file_stats:
-            lines.append(
-                f"File: {stat.name} Size: {stat.size} bytes Success: {stat.success}"\
-                f" ConnectTime: {stat.connect_time:.2f}s TransferTime: {stat.transfer_time:.2f}s"\
-                + (f" Error: {stat.error}" if stat.error else "")
-            )
-        return "\n".join(lines)
+
+def _read_stats(path: str) -> Iterator[FileStat]:
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield FileStat(**json.loads(line))
+
+
+def _report_lines(stats: Iterable[FileStat]) -> Iterator[str]:
+    yield REPORT_HEADER
+    for stat in stats:
+        yield _format_line(stat)
 
 
 def create_random_zip(destination: str, size: int) -> None:
-    with tempfile.TemporaryDirectory() as tmpdir:
-        data_path = os.path.join(tmpdir, "data.bin")
-        with open(data_path, "wb") as f:
-            f.write(os.urandom(size))
-        with zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED) as zf:
-            zf.write(data_path, arcname="data.bin")
+    # Random bytes don't compress, so store them as-is. Generate them a chunk
+    # at a time so memory stays bounded regardless of ``size``.
+    with zipfile.ZipFile(destination, "w", zipfile.ZIP_STORED) as zf:
+        with zf.open("data.bin", "w", force_zip64=size > zipfile.ZIP64_LIMIT) as f:
+            remaining = size
+            while remaining > 0:
+                n = min(remaining, UPLOAD_CHUNK_SIZE)
+                f.write(os.urandom(n))
+                remaining -= n
 
 
 def _validate_key_permissions(path: str) -> None:
@@ -63,118 +102,560 @@ def _validate_key_permissions(path: str) -> None:
         )
 
 
-def _create_client(config: SFTPConfig) -> paramiko.SSHClient:
-    client = paramiko.SSHClient()
-    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    if config.ssh_private_key_path:
-        _validate_key_permissions(config.ssh_private_key_path)
-    client.connect(
-        hostname=config.host,
-        username=config.username,
-        key_filename=config.ssh_private_key_path,
-        passphrase=config.ssh_private_key_passphrase,
-        timeout=None if config.connect_timeout_seconds == -1 else config.connect_timeout_seconds,
-    )
+def _open_socket(config: SFTPConfig) -> socket.socket:
+    """Connect to the first reachable address of ``config.host``, like
+    socket.create_connection but with the socket tuned before connecting."""
+    timeout = None if config.connect_timeout_seconds == -1 else config.connect_timeout_seconds
+    last_error: Optional[OSError] = None
+    for family, socktype, proto, _, addr in socket.getaddrinfo(
+        config.host, SSH_PORT, 0, socket.SOCK_STREAM
+    ):
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+            sock.settimeout(timeout)
+            sock.connect(addr)
+            return sock
+        except OSError as e:
+            sock.close()
+            last_error = e
+    raise last_error or OSError(f"getaddrinfo returned no addresses for {config.host}")
+
+
+def _passphrase(config: SFTPConfig) -> Optional[bytes]:
+    # PKey.from_path hands the passphrase to cryptography, which wants bytes.
+    passphrase = config.ssh_private_key_passphrase
+    return passphrase.encode() if isinstance(passphrase, str) else passphrase
+
+
+def _load_private_key(config: SFTPConfig) -> Optional[paramiko.PKey]:
+    """Parse the configured private key, or return None if none is set."""
+    if not config.ssh_private_key_path:
+        return None
+    _validate_key_permissions(config.ssh_private_key_path)
+    return paramiko.PKey.from_path(config.ssh_private_key_path, _passphrase(config))
+
+
+DEFAULT_KEY_NAMES = ("id_rsa", "id_ecdsa", "id_ed25519")
+
+
+def _load_fallback_keys(config: SFTPConfig) -> Tuple[paramiko.Agent, List[paramiko.PKey]]:
+    """Return the SSH agent and its keys followed by the loadable ~/.ssh/id_*
+    keys, in the order SSHClient.connect tries them when no key file is given.
+
+    Agent keys sign through the returned agent, so the caller must keep it
+    open for as long as the keys are in use.
+    """
+    agent = paramiko.Agent()
+    keys: List[paramiko.PKey] = list(agent.get_keys())
+    for name in DEFAULT_KEY_NAMES:
+        path = os.path.expanduser(os.path.join("~", ".ssh", name))
+        if not os.path.isfile(path):
+            continue
+        try:
+            keys.append(paramiko.PKey.from_path(path, _passphrase(config)))
+        except (paramiko.SSHException, paramiko.UnknownKeyType, OSError, ValueError):
+            continue
+    return agent, keys
+
+
+# Every agent key shares one agent socket, which Paramiko doesn't lock.
+_agent_lock = threading.Lock()
+
+
+def _create_client(config: SFTPConfig) -> paramiko.Transport:
+    pkey = config.pkey
+    transport = paramiko.Transport(_open_socket(config))
+    transport.default_window_size = TRANSPORT_WINDOW_SIZE
+    # Only worth it for compressible payloads; the generated random zips gain
+    # nothing and just spend CPU on zlib.
+    transport.use_compression(bool(config.ssh_compression))
+    try:
+        transport.connect(username=config.username, pkey=pkey)
+        if pkey is None:
+            # No key configured: try the agent and default key files instead.
+            for candidate in config.fallback_keys:
+                lock = _agent_lock if isinstance(candidate, paramiko.AgentKey) else nullcontext()
+                try:
+                    with lock:
+                        transport.auth_publickey(config.username, candidate)
+                    break
+                except paramiko.AuthenticationException:
+                    continue
+        if not transport.is_authenticated():
+            raise paramiko.AuthenticationException(
+                f"Unable to authenticate as '{config.username}'"
+            )
+    except Exception:
+        transport.close()
+        raise
+    return transport
+
+
+def _upload(
+    sftp: paramiko.SFTPClient, local_path: str, remote_path: str, block_size: int, cb
+) -> None:
+    """Stream ``local_path`` to ``remote_path`` with pipelined SFTP writes."""
+    # Unbuffered: we already write in UPLOAD_CHUNK_SIZE pieces, and a buffered
+    # SFTPFile would copy each memoryview chunk twice before sending it.
+    with open(local_path, "rb") as lf, sftp.file(remote_path, "wb") as rf:
+        # Paramiko caps each write request at 32 KiB; allow larger requests on
+        # this file only rather than patching SFTPFile globally.
+        rf.MAX_REQUEST_SIZE = block_size
+        # Don't wait for each write to be acknowledged before sending the next.
+        rf.set_pipelined(True)
+        file_size = os.fstat(lf.fileno()).st_size
+        if file_size > 0:
+            with mmap.mmap(lf.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Have the kernel read ahead so the next chunk's disk I/O is
+                # already in flight while the current one is encrypted and sent.
+                for advice in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+                    if hasattr(mmap, advice):
+                        mm.madvise(getattr(mmap, advice))
+                view = memoryview(mm)
+                try:
+                    offset = 0
+                    while offset < file_size:
+                        # Release the slice even if the write fails, or closing
+                        # the mmap raises BufferError and hides the SFTP error.
+                        with view[offset:offset + UPLOAD_CHUNK_SIZE] as chunk:
+                            rf.write(chunk)
+                            offset += len(chunk)
+                        cb(offset, file_size)
+                finally:
+                    view.release()
+    # close() drops any pipelined write errors it hasn't read yet, so confirm
+    # the result the way SFTPClient.put(confirm=True) does.
+    remote_size = sftp.stat(remote_path).st_size
+    if remote_size != file_size:
+        raise IOError(f"size mismatch in put! {remote_size} != {file_size}")
+
+
+# Each worker thread keeps its own connection; Paramiko serializes SFTP sessions
+# that share a Transport, so connections are never handed between threads.
+_tls = threading.local()
+_open_clients: List[paramiko.Transport] = []
+_open_clients_lock = threading.Lock()
+
+
+def _get_client(config: SFTPConfig) -> paramiko.Transport:
+    """Return this thread's connection, creating it on first use."""
+    client = getattr(_tls, "client", None)
+    if client is None or not client.is_active():
+        if client is not None:
+            _release_client()
+        client = _create_client(config)
+        _tls.client = client
+        with _open_clients_lock:
+            _open_clients.append(client)
     return client
 
 
+def _release_client() -> None:
+    """Close this thread's connection, if any."""
+    client = getattr(_tls, "client", None)
+    if client is None:
+        return
+    _tls.client = None
+    with _open_clients_lock:
+        _open_clients.remove(client)
+    client.close()
+
+
+def _close_all_clients() -> None:
+    with _open_clients_lock:
+        clients = list(_open_clients)
+        _open_clients.clear()
+    for client in clients:
+        client.close()
+
+
 def sftp_operation(
     config: SFTPConfig,
     local_path: str,
     remote_name: str,
-    client: Optional[paramiko.SSHClient] = None,
-    position: int = 0,
+    remote_path: str,
+    progress: Optional[tqdm] = None,
 ) -> FileStat:
     file_size = os.path.getsize(local_path)
-    if client is None:
-        start_conn = time.monotonic()
-        try:
-            client = _create_client(config)
-            connect_time = time.monotonic() - start_conn
-        except Exception as e:
-            return FileStat(remote_name, file_size, time.monotonic() - start_conn, 0, False, str(e))
-    else:
-        connect_time = 0.0
+    start_conn = time.monotonic()
+    try:
+        client = _get_client(config)
+    except Exception as e:
+        return FileStat(remote_name, file_size, time.monotonic() - start_conn, 0, False, str(e))
+    connect_time = time.monotonic() - start_conn
 
-    sftp = client.open_sftp()
+    sftp = paramiko.SFTPClient.from_transport(client)
     start_transfer = time.monotonic()
-    pbar = tqdm(
-        total=file_size,
-        desc=f"Uploading {remote_name}",
-        unit="B",
-        unit_scale=True,
-        position=position,
-        leave=False,
-    )
+    reported = 0
 
     def cb(transferred, total):
-        pbar.update(transferred - pbar.n)
+        # _upload reports once per UPLOAD_CHUNK_SIZE, so this is already
+        # coalesced to about one update per MiB.
+        nonlocal reported
+        if progress is not None:
+            progress.update(transferred - reported)
+        reported = transferred
 
     try:
-        sftp.put(local_path, os.path.join(config.root_dir, remote_name), callback=cb)
-        sftp.remove(os.path.join(config.root_dir, remote_name))
+        _upload(sftp, local_path, remote_path, config.sftp_block_size, cb)
         success = True
         error = None
     except Exception as e:
         success = False
         error = str(e)
-    pbar.close()
     transfer_time = time.monotonic() - start_transfer
     sftp.close()
     if not config.keep_alive_enabled:
-        client.close()
+        _release_client()
     if config.sftp_sleep_interval > 0:
         time.sleep(config.sftp_sleep_interval)
     return FileStat(remote_name, file_size, connect_time, transfer_time, success, error)
 
 
-def run_tests(config: SFTPConfig) -> TestReport:
+def _remove_remote(config: SFTPConfig, remote_paths: List[str]) -> None:
+    """Delete the uploaded files over one SFTP session, outside the timed uploads.
+
+    Runs during cleanup, so failures are logged rather than raised.
+    """
+    if not remote_paths:
+        return
+    try:
+        client = _create_client(config)
+    except Exception as e:
+        logging.error(f"Could not connect to remove uploaded files: {e}")
+        return
+    try:
+        sftp = paramiko.SFTPClient.from_transport(client)
+        for remote_path in remote_paths:
+            try:
+                sftp.remove(remote_path)
+            except FileNotFoundError:
+                pass  # the upload never got as far as creating it
+            except Exception as e:
+                logging.warning(f"Failed to remove {remote_path}: {e}")
+    finally:
+        client.close()
+
+
+def _describe(e: BaseException) -> str:
+    # asyncio's TimeoutError has an empty message; fall back to its type.
+    return str(e) or type(e).__name__
+
+
+async def _connect_async(config: SFTPConfig, client_keys) -> "asyncssh.SSHClientConnection":
+    return await asyncssh.connect(
+        config.host,
+        port=SSH_PORT,
+        username=config.username,
+        client_keys=client_keys,
+        known_hosts=None,
+        connect_timeout=None if config.connect_timeout_seconds == -1 else config.connect_timeout_seconds,
+        compression_algs=["zlib@openssh.com", "none"] if config.ssh_compression else ["none"],
+        window=TRANSPORT_WINDOW_SIZE,
+    )
+
+
+async def _async_worker(
+    config: SFTPConfig,
+    work_queue: "asyncio.Queue",
+    client_keys,
+    progress: tqdm,
+    record: Callable[[FileStat], None],
+    attempted: List[str],
+) -> None:
+    """Upload files from ``work_queue`` until it yields None, like one pool thread.
+
+    Each remote path is appended to ``attempted`` before its upload starts.
+    """
+    conn = sftp = None
+    try:
+        while (item := await work_queue.get()) is not None:
+            local_path, remote_name, remote_path = item
+            file_size = os.path.getsize(local_path)
+            start_conn = time.monotonic()
+            try:
+                if conn is None:
+                    conn = await _connect_async(config, client_keys)
+                    sftp = await conn.start_sftp_client()
+            except Exception as e:
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                record(FileStat(remote_name, file_size, time.monotonic() - start_conn, 0, False, _describe(e)))
+                continue
+            connect_time = time.monotonic() - start_conn
+
+            reported = 0
+
+            def cb(src, dst, transferred, total):
+                nonlocal reported
+                progress.update(transferred - reported)
+                reported = transferred
+
+            attempted.append(remote_path)
+            start_transfer = time.monotonic()
+            try:
+                await sftp.put(local_path, remote_path, block_size=config.sftp_block_size, progress_handler=cb)
+                success = True
+                error = None
+            except Exception as e:
+                success = False
+                error = _describe(e)
+                # Don't keep reusing a connection that died mid-transfer; the
+                # next file reconnects, as _get_client does for Paramiko.
+                if conn.is_closed() or isinstance(e, (asyncssh.ConnectionLost, asyncssh.DisconnectError)):
+                    conn.close()
+                    conn = sftp = None
+            transfer_time = time.monotonic() - start_transfer
+            if not config.keep_alive_enabled and conn is not None:
+                sftp.exit()
+                conn.close()
+                conn = sftp = None
+            if config.sftp_sleep_interval > 0:
+                await asyncio.sleep(config.sftp_sleep_interval)
+            record(FileStat(remote_name, file_size, connect_time, transfer_time, success, error))
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+async def _upload_all_async(
+    config: SFTPConfig,
+    gen_futures: Iterable[Future],
+    ready: Callable[[Future], Tuple[str, str, str]],
+    progress: tqdm,
+    record: Callable[[FileStat], None],
+    max_workers: int,
+    attempted: List[str],
+) -> None:
+    """Upload every generated file with asyncssh, ``max_workers`` at a time,
+    then remove whatever was uploaded, even if the run is aborted."""
+    # asyncssh's own default; None would disable public-key auth entirely,
+    # agent and ~/.ssh keys included.
+    client_keys = ()
+    if config.ssh_private_key_path:
+        _validate_key_permissions(config.ssh_private_key_path)
+        client_keys = [
+            asyncssh.read_private_key(config.ssh_private_key_path, config.ssh_private_key_passphrase)
+        ]
+
+    work_queue: asyncio.Queue = asyncio.Queue()
+
+    async def generated(future: Future) -> Future:
+        await asyncio.wrap_future(future)
+        return future
+
+    async def feed() -> None:
+        for next_done in asyncio.as_completed([generated(f) for f in gen_futures]):
+            await work_queue.put(ready(await next_done))
+        for _ in range(max_workers):
+            await work_queue.put(None)
+
+    tasks = [
+        asyncio.ensure_future(feed()),
+        *(
+            asyncio.ensure_future(
+                _async_worker(config, work_queue, client_keys, progress, record, attempted)
+            )
+            for _ in range(max_workers)
+        ),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # On failure or cancellation, stop the remaining workers before
+        # cleaning up behind them. Both are no-ops after a clean run.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await _remove_remote_async(config, client_keys, attempted)
+
+
+async def _remove_remote_async(config: SFTPConfig, client_keys, remote_paths: List[str]) -> None:
+    """asyncssh counterpart of _remove_remote; failures are logged, not raised."""
+    if not remote_paths:
+        return
+    try:
+        conn = await _connect_async(config, client_keys)
+        async with conn, conn.start_sftp_client() as sftp:
+            # asyncssh pipelines these requests over the one SFTP session.
+            results = await asyncio.gather(
+                *(sftp.remove(remote_path) for remote_path in remote_paths),
+                return_exceptions=True,
+            )
+    except Exception as e:
+        logging.error(f"Could not remove uploaded files: {_describe(e)}")
+        return
+    for remote_path, result in zip(remote_paths, results):
+        if isinstance(result, Exception) and not isinstance(result, asyncssh.SFTPNoSuchFile):
+            logging.warning(f"Failed to remove {remote_path}: {result}")
+
+
+def _drain_results(
+    results: "queue.SimpleQueue",
+    record: Callable[[FileStat], None],
+    errors: List[BaseException],
+) -> None:
+    """Pass every FileStat from ``results`` to ``record`` until None arrives.
+
+    If ``record`` raises, the exception is appended to ``errors`` for the
+    caller to re-raise, and the rest of the queue is drained without
+    recording.
+    """
+    while (stat := results.get()) is not None:
+        if errors:
+            continue
+        try:
+            record(stat)
+        except BaseException as e:
+            errors.append(e)
+
+
+def run_tests(config: SFTPConfig, out_path: str) -> None:
+    """Upload the test files, appending one JSON line per file to ``out_path``."""
+    agent = None
+    if config.transfer_backend == "asyncssh":
+        if asyncssh is None:
+            raise RuntimeError("transfer_backend 'asyncssh' requires the asyncssh package")
+    elif config.pkey is None:
+        # Parse (and for encrypted keys, run the KDF) once rather than per connection.
+        config.pkey = _load_private_key(config)
+        if config.pkey is None:
+            # Same for the agent and ~/.ssh keys tried in place of a key file.
+            agent, config.fallback_keys = _load_fallback_keys(config)
     temp_dir = tempfile.mkdtemp()
-    report = TestReport()
     paths = []
+    # Remote paths whose upload has started, so an aborted run can still
+    # remove what it left on the server.
+    attempted: List[str] = []
     try:
+        # SFTP paths are always POSIX, whatever the local OS.
+        root_dir = posixpath.normpath(config.root_dir)
         for i in range(config.num_test_files):
-            size = random.randint(config.min_test_file_size_bytes, config.max_test_file_size_bytes)
-            local_path = os.path.join(temp_dir, f"test_{i}.zip")
-            create_random_zip(local_path, size)
-            paths.append((local_path, f"test_{i}.zip"))
-        max_workers = config.sftp_threads if config.sftp_threads > 0 else os.cpu_count()
-        if config.keep_alive_enabled:
-            clients = [_create_client(config) for _ in range(max_workers)]
-        else:
-            clients = [None] * max_workers
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for idx, (path, name) in enumerate(paths):
-                client = clients[idx % max_workers]
-                futures.append(
-                    executor.submit(sftp_operation, config, path, name, client, idx)
-                )
+            name = f"test_{i}.zip"
+            paths.append((os.path.join(temp_dir, name), name, posixpath.join(root_dir, name)))
+        sizes = [
+            random.randint(config.min_test_file_size_bytes, config.max_test_file_size_bytes)
+            for _ in paths
+        ]
+        # os.cpu_count() may return None; never start more workers (and
+        # connections) than there are files to upload.
+        cpu_count = os.cpu_count() or 4
+        max_workers = config.sftp_threads if config.sftp_threads > 0 else cpu_count
+        max_workers = max(1, min(max_workers, len(paths)))
 
-            progress = tqdm(total=len(futures), desc="Files uploaded", unit="file", position=max_workers)
-            for future in as_completed(futures):
-                stat = future.result()
-                report.add(stat)
-                progress.update(1)
+        # Generate payloads in the background and start uploading each one as
+        # soon as it is ready rather than after the whole batch exists.
+        # Generation is CPU-bound, so its pool follows the CPU count rather
+        # than max_workers.
+        with open(out_path, "w") as out, \
+                ThreadPoolExecutor(max_workers=cpu_count) as gen_pool, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            gen_futures = {
+                gen_pool.submit(create_random_zip, path, size): idx
+                for idx, ((path, _, _), size) in enumerate(zip(paths, sizes))
+            }
+            # One aggregate bar for all workers; per-file bars redraw the
+            # terminal from every thread and contend on tqdm's lock.
+            progress = tqdm(
+                total=sum(sizes),
+                desc="Uploading",
+                unit="B",
+                unit_scale=True,
+                mininterval=0.2,
+            )
+
+            def ready(gen_future: Future) -> Tuple[str, str, str]:
+                gen_future.result()
+                idx = gen_futures[gen_future]
+                path = paths[idx][0]
+                # Account for the zip container's overhead on top of the payload.
+                progress.total += os.path.getsize(path) - sizes[idx]
+                return paths[idx]
+
+            done = 0
+
+            def record(stat: FileStat) -> None:
+                nonlocal done
+                done += 1
+                out.write(json.dumps(asdict(stat)) + "\n")
+                if done % RESULTS_FLUSH_EVERY == 0:
+                    out.flush()
+                progress.set_postfix_str(f"{done}/{len(paths)} files", refresh=False)
                 if not stat.success:
                     logging.error(f"Failed to transfer {stat.name}: {stat.error}")
-            progress.close()
 
-        if config.keep_alive_enabled:
-            for c in clients:
-                c.close()
+            if config.transfer_backend == "asyncssh":
+                asyncio.run(
+                    _upload_all_async(
+                        config, gen_futures, ready, progress, record, max_workers, attempted
+                    )
+                )
+            else:
+                # Workers hand results to a single consumer thread, so writing,
+                # logging and progress updates never hold up job submission.
+                results: queue.SimpleQueue = queue.SimpleQueue()
+                record_errors: List[BaseException] = []
+                consumer = threading.Thread(
+                    target=_drain_results, args=(results, record, record_errors)
+                )
+                consumer.start()
+
+                def upload(local_path: str, remote_name: str, remote_path: str) -> None:
+                    attempted.append(remote_path)
+                    try:
+                        stat = sftp_operation(config, local_path, remote_name, remote_path, progress)
+                    except Exception as e:
+                        stat = FileStat(remote_name, 0, 0, 0, False, str(e))
+                    results.put(stat)
+
+                try:
+                    for gen_future in as_completed(gen_futures):
+                        executor.submit(upload, *ready(gen_future))
+                    executor.shutdown(wait=True)
+                finally:
+                    # Only send the sentinel once running uploads have queued
+                    # their stats. If we're bailing out, drop the uploads that
+                    # haven't started, and the payloads nobody will upload;
+                    # both are no-ops after a clean shutdown.
+                    gen_pool.shutdown(wait=True, cancel_futures=True)
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    results.put(None)
+                    consumer.join()
+                if record_errors:
+                    raise record_errors[0]
+            progress.close()
     finally:
-        for path, _ in paths:
+        _close_all_clients()
+        if config.transfer_backend != "asyncssh":
+            _remove_remote(config, attempted)
+        for path, _, _ in paths:
             if os.path.exists(path):
                 os.remove(path)
         os.rmdir(temp_dir)
-    return report
+        if agent is not None:
+            agent.close()
+            config.fallback_keys = []
+
+
+def _warm_up_crypto() -> None:
+    """Exercise the key exchange, cipher and MAC primitives once.
+
+    The first use of each initializes OpenSSL state lazily, which would
+    otherwise be billed to the first file's connect time.
+    """
+    x25519.X25519PrivateKey.generate().exchange(x25519.X25519PrivateKey.generate().public_key())
+    Cipher(algorithms.AES(bytes(32)), modes.CTR(bytes(16))).encryptor().update(bytes(16))
+    hmac.HMAC(bytes(32), hashes.SHA256()).finalize()
 
 
-def save_report(report: TestReport, filename: str) -> None:
+def save_report(results_path: str, filename: str) -> None:
+    """Render the NDJSON results written by run_tests as a text report."""
     with open(filename, "w") as f:
-        f.write(report.to_text())
+        f.writelines(_report_lines(_read_stats(results_path)))
 
 
 def main():
@@ -188,11 +669,18 @@ def main():
     args = parser.parse_args()
 
     config = SFTPConfig.from_yaml(args.config)
+    # Paramiko and asyncssh log every connect and auth at INFO; keep that off
+    # the hot path.
+    logging.getLogger("paramiko").setLevel(logging.WARNING)
+    logging.getLogger("asyncssh").setLevel(logging.WARNING)
+    _warm_up_crypto()
 
-    report = run_tests(config)
-    filename = f"sftp_report_{int(time.time())}.txt"
-    save_report(report, filename)
-    print(f"Report saved to {filename}")
+    base = f"sftp_report_{int(time.time())}"
+    results_path = f"{base}.jsonl"
+    run_tests(config, results_path)
+    filename = f"{base}.txt"
+    save_report(results_path, filename)
+    print(f"Report saved to {filename} (raw results in {results_path})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import dataclasses
+import json
+import os
+
+import jsonschema
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+import sftp_tester
+from sftp_config import SFTPConfig
+
+
+def test_load_private_key_accepts_str_passphrase(tmp_path):
+    key_path = tmp_path / "id_ed25519"
+    key = ed25519.Ed25519PrivateKey.generate()
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.OpenSSH,
+            serialization.BestAvailableEncryption(b"secret"),
+        )
+    )
+    os.chmod(key_path, 0o600)
+
+    config = SFTPConfig()
+    config.ssh_private_key_path = str(key_path)
+    config.ssh_private_key_passphrase = "secret"
+
+    pkey = sftp_tester._load_private_key(config)
+
+    assert pkey.get_name() == "ssh-ed25519"
+
+
+def test_load_fallback_keys_parses_default_key_files_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("SSH_AUTH_SOCK", raising=False)
+    (tmp_path / ".ssh").mkdir()
+    (tmp_path / ".ssh" / "id_ed25519").write_bytes(
+        ed25519.Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.OpenSSH,
+            serialization.NoEncryption(),
+        )
+    )
+
+    agent, keys = sftp_tester._load_fallback_keys(SFTPConfig())
+    agent.close()
+
+    assert [key.get_name() for key in keys] == ["ssh-ed25519"]
+
+def test_config_cache_ignores_sidecar_for_replaced_older_yaml(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text("host: new\nusername: u\n")
+    os.utime(config_path, (1_000_000, 1_000_000))
+    (tmp_path / "config.yml.json").write_text(
+        '{"source": {"mtime_ns": 1, "size": 1}, "data": {"host": "old", "username": "u"}}'
+    )
+
+    assert SFTPConfig.from_yaml(str(config_path)).host == "new"
+    assert SFTPConfig.from_yaml(str(config_path)).host == "new"
+
+
+class _ShortWriteSFTP:
+    """Stands in for an SFTPClient whose server silently drops part of a write."""
+
+    class _File:
+        def __init__(self):
+            self.written = 0
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def set_pipelined(self, pipelined):
+            pass
+
+        def write(self, data):
+            # The server rejects everything after the first byte, but the
+            # pipelined error reply is never read.
+            self.written = 1
+
+    def __init__(self):
+        self.remote = self._File()
+
+    def file(self, path, mode, bufsize=-1):
+        return self.remote
+
+    def stat(self, path):
+        return os.stat_result((0, 0, 0, 0, 0, 0, self.remote.written, 0, 0, 0))
+
+
+def test_upload_raises_when_remote_size_does_not_match(tmp_path):
+    local_path = tmp_path / "payload.bin"
+    local_path.write_bytes(b"x" * 4096)
+
+    with pytest.raises(IOError, match="size mismatch"):
+        sftp_tester._upload(_ShortWriteSFTP(), str(local_path), "/payload.bin", 32768, lambda *a: None)
+
+
+def test_config_rejects_unknown_keys(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text("host: h\nusername: u\nsftp_threds: 4\n")
+
+    with pytest.raises(jsonschema.ValidationError, match="sftp_threds"):
+        SFTPConfig.from_yaml(str(config_path))
+
+
+def test_config_checks_lone_max_size_against_default_min(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text("host: h\nusername: u\nmax_test_file_size_bytes: 1000\n")
+
+    with pytest.raises(jsonschema.ValidationError, match="min_test_file_size_bytes"):
+        SFTPConfig.from_yaml(str(config_path))
+
+def test_config_rejects_block_size_above_openssh_limit(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text("host: h\nusername: u\nsftp_block_size: 1048576\n")
+
+    with pytest.raises(jsonschema.ValidationError, match="1048576"):
+        SFTPConfig.from_yaml(str(config_path))
+
+def test_config_coerces_integral_floats_to_int(tmp_path):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text("host: h\nusername: u\nnum_test_files: 2.0\nsftp_threads: 3.0\n")
+
+    config = SFTPConfig.from_yaml(str(config_path))
+
+    assert type(config.num_test_files) is int and config.num_test_files == 2
+    assert type(config.sftp_threads) is int and config.sftp_threads == 3
+
+
+def test_save_report_renders_ndjson_results(tmp_path):
+    results_path = tmp_path / "results.jsonl"
+    stats = [
+        sftp_tester.FileStat("test_0.zip", 1024, 0.5, 1.25, True),
+        sftp_tester.FileStat("test_1.zip", 2048, 0.125, 0, False, "disk full"),
+    ]
+    results_path.write_text(
+        "".join(json.dumps(dataclasses.asdict(stat)) + "\n" for stat in stats) + "\n"
+    )
+    report_path = tmp_path / "report.txt"
+
+    sftp_tester.save_report(str(results_path), str(report_path))
+
+    assert list(sftp_tester._read_stats(str(results_path))) == stats
+    assert report_path.read_text() == (
+        "SFTP Test Report\n=================\n"
+        "File: test_0.zip Size: 1024 bytes Success: True ConnectTime: 0.50s TransferTime: 1.25s\n"
+        "File: test_1.zip Size: 2048 bytes Success: False ConnectTime: 0.12s TransferTime: 0.00s"
+        " Error: disk full\n"
+    )